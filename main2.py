@@ -1,15 +1,20 @@
-from fastapi import FastAPI
-from fastapi.responses import PlainTextResponse
+from fastapi import FastAPI, Response
 from fastmcp import FastMCP
 import fastmcp
 
 
-app = FastAPI(title="MCP Server API")
 mcp = FastMCP("mcp-server")
 
 # Allow Streamable HTTP transport to work without session negotiation
 fastmcp.settings.stateless_http = True
 
+# Build the MCP ASGI app once at import and hand its lifespan to FastAPI so
+# the session manager starts and stops with the outer app. The mount itself
+# happens at the bottom of the module, after the REST routes.
+_mcp_asgi = mcp.http_app(path="/mcp")
+
+app = FastAPI(title="MCP Server API", lifespan=_mcp_asgi.lifespan)
+
 
 # Shared payload for every surface (REST + MCP tool)
 STATIC_TEXT = "This is a static response from /read-file."
@@ -20,14 +25,24 @@ def _get_static_text() -> str:
     return STATIC_TEXT
 
 
-@app.get("/read-file", response_class=PlainTextResponse, summary="Return static text")
-async def read_file() -> str:
+# Rendered once at import; the endpoint hands back the same Response object so
+# the hot path skips per-request PlainTextResponse construction entirely.
+_STATIC_RESPONSE_BYTES = STATIC_TEXT.encode("utf-8")
+_STATIC_RESPONSE = Response(content=_STATIC_RESPONSE_BYTES, media_type="text/plain")
+
+
+@app.get("/read-file", summary="Return static text")
+async def read_file() -> Response:
     """Legacy REST endpoint backed by the shared helper."""
-    return _get_static_text()
+    return _STATIC_RESPONSE
+
 
+async def read_file_mcp() -> str:
+    """MCP tool; reachable over Streamable HTTP transport.
 
-def read_file_mcp() -> str:
-    """MCP tool; reachable over Streamable HTTP transport."""
+    async so FastMCP runs it on the event loop instead of bouncing a sync
+    handler through the thread pool.
+    """
     return _get_static_text()
 
 
@@ -36,6 +51,13 @@ def read_file_mcp() -> str:
 mcp.tool()(read_file_mcp)
 
 
+# Mounted at the app root, after the REST routes: Starlette's Mount("/mcp")
+# only matches /mcp/... (a bare /mcp either 307s or 404s), whereas at the
+# root the inner route matches POST /mcp exactly. Routes match in
+# registration order, so /read-file above still wins.
+app.mount("", _mcp_asgi)
+
+
 if __name__ == "__main__":
     import uvicorn
     import asyncio
@@ -51,8 +73,17 @@ if __name__ == "__main__":
         
         asyncio.run(run_server())
     else:
-        # Run FastAPI app
-        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+        # Run FastAPI app; httptools + uvloop drop a chunk of per-request
+        # overhead vs the default h11 + asyncio pairing.
+        uvicorn.run(
+            "main2:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            http="httptools",
+            loop="uvloop",
+            access_log=False,
+        )
 
 
 
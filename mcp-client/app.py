@@ -1,10 +1,16 @@
+import concurrent.futures
 import json
-from typing import Any, Dict, List, Optional
+import re
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime
 
+import msgspec
+import orjson
 import streamlit as st
 from openai import OpenAI
-from mcp_clients import MCPSSEClient
+from mcp_clients import MCPHttpClient, MCPSSEClient
 
 # Page configuration
 st.set_page_config(page_title="Content Generator", page_icon="✨", layout="centered")
@@ -19,6 +25,34 @@ READ_TOOL_CANDIDATES = [
     "read_from_file",
 ]
 DEFAULT_FILE_PATH = "sample.txt"
+TOOLS_TTL_SECONDS = 60.0
+# Fallback matcher for read-ish tool names; compiled once so the per-run scan
+# avoids lowercasing and double substring checks per tool.
+_READ_FILE_RE = re.compile(r"(?:read.*file|file.*read)", re.IGNORECASE)
+
+
+class AgentRun(msgspec.Struct):
+    """One agent run in history; slots-backed, so Streamlit's per-rerun
+    session-state snapshot stays small compared to nested dicts."""
+
+    timestamp: str
+    request: str
+    plan: Dict[str, Any]
+    arguments_used: Dict[str, Any]
+    final_response: str
+    tool_result: Optional[Dict[str, Any]] = None
+    tool_error: Optional[str] = None
+
+
+@st.cache_resource(show_spinner=False)
+def _openai_client(api_key: str) -> OpenAI:
+    """Reuse one pooled OpenAI client per API key across Streamlit reruns.
+
+    st.cache_resource survives reruns (the page script re-executes top to
+    bottom per interaction, so a module-level lru_cache would be rebuilt
+    every time along with its TLS pool).
+    """
+    return OpenAI(api_key=api_key)
 
 
 if 'mcp_client' not in st.session_state:
@@ -31,15 +65,26 @@ if 'mcp_server_url' not in st.session_state:
     st.session_state.mcp_server_url = ""
 if 'available_tools' not in st.session_state:
     st.session_state.available_tools = []
+if 'tools_by_name' not in st.session_state:
+    st.session_state.tools_by_name = {}
 if 'agent_history' not in st.session_state:
-    st.session_state.agent_history = []
-
-def get_mcp_client(endpoint: str) -> Optional[MCPSSEClient]:
-    """Get or create MCP client for the selected transport."""
+    # Bounded container: appendleft is O(1) and the deque drops the oldest
+    # entry itself, so no per-run list shift or re-slice.
+    st.session_state.agent_history = deque(maxlen=10)
+
+def get_mcp_client(endpoint: str):
+    """Get or create MCP client for the selected transport.
+
+    Endpoints ending in `/mcp` use the request/response HTTP client; this
+    workload only does discrete tools/list + tools/call RPCs, so a persistent
+    SSE stream buys nothing. `/sse` endpoints keep the SSE transport for
+    notification-heavy servers.
+    """
     if not endpoint:
         return None
 
-    key = ("SSE", endpoint)
+    use_http = endpoint.rstrip("/").endswith("/mcp")
+    key = ("HTTP" if use_http else "SSE", endpoint)
     current_key = st.session_state.get("mcp_client_key")
     current_client = st.session_state.get("mcp_client")
 
@@ -50,10 +95,15 @@ def get_mcp_client(endpoint: str) -> Optional[MCPSSEClient]:
             pass
         st.session_state.mcp_client = None
         st.session_state.mcp_connected = False
+        # The TTL cache belongs to the old server; without this, a Connect
+        # within the TTL would report the previous server's tools.
+        st.session_state.available_tools = []
+        st.session_state.tools_by_name = {}
+        st.session_state.pop("tools_fetched_at", None)
 
     if st.session_state.mcp_client is None:
         try:
-            client = MCPSSEClient(endpoint)
+            client = MCPHttpClient(endpoint) if use_http else MCPSSEClient(endpoint)
             client.connect()
             st.session_state.mcp_client = client
             st.session_state.mcp_client_key = key
@@ -70,11 +120,22 @@ def discover_tools(mcp_client) -> list:
     """Discover available tools from MCP server"""
     if not mcp_client:
         return []
-    
+
+    # The server's tool list rarely changes; within the TTL, reruns reuse the
+    # cached list instead of paying a discovery round-trip.
+    cached = st.session_state.get("available_tools")
+    fetched_at = st.session_state.get("tools_fetched_at")
+    if cached and fetched_at is not None and time.monotonic() - fetched_at < TOOLS_TTL_SECONDS:
+        return cached
+
     try:
         tools = mcp_client.discover_tools()
+        st.session_state.tools_fetched_at = time.monotonic()
         if tools:
             st.session_state.available_tools = tools
+            st.session_state.tools_by_name = {
+                tool["name"]: tool for tool in tools if tool.get("name")
+            }
             st.session_state.mcp_connected = True
             return tools
         else:
@@ -106,15 +167,17 @@ def call_mcp_tool(mcp_client, tool_name: str, arguments: Optional[Dict[str, Any]
 
 def find_read_tool(tools: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     """Locate the file-reading tool from the discovered MCP tools."""
-    for candidate in READ_TOOL_CANDIDATES:
-        for tool in tools:
-            if tool.get("name") == candidate:
-                return tool
+    tools_by_name = {tool["name"]: tool for tool in tools if tool.get("name")}
+    match = next(
+        (tools_by_name[candidate] for candidate in READ_TOOL_CANDIDATES if candidate in tools_by_name),
+        None,
+    )
+    if match is not None:
+        return match
 
-    for tool in tools:
-        name = (tool.get("name") or "").lower()
-        if "read" in name and "file" in name:
-            return tool
+    match = next((tool for tool in tools if _READ_FILE_RE.search(tool.get("name") or "")), None)
+    if match is not None:
+        return match
 
     return tools[0] if tools else None
 
@@ -141,7 +204,7 @@ def prepare_tool_arguments(tool: Optional[Dict[str, Any]], planned_args: Dict[st
             if default_value is not None:
                 args[param] = default_value
 
-    missing = [param for param in required if param not in args or args[param] in (None, "")]
+    missing = [param for param in required if args.get(param) in (None, "")]
     if missing:
         raise ValueError(f"Missing required arguments: {', '.join(missing)}")
 
@@ -157,38 +220,68 @@ def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
         return None
     candidate = text[start : end + 1]
     try:
-        return json.loads(candidate)
-    except json.JSONDecodeError:
+        return orjson.loads(candidate)
+    except (orjson.JSONDecodeError, json.JSONDecodeError):
         return None
 
 
+def _tool_catalog_key(tools: List[Dict[str, Any]]) -> tuple:
+    """Flatten the discovered tools into a hashable cache key."""
+    key = []
+    for tool in tools:
+        schema = tool.get("inputSchema", {})
+        properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
+        params = tuple(
+            (param_name, param_info.get("type", "string"), param_info.get("description", ""))
+            for param_name, param_info in properties.items()
+        )
+        key.append((tool.get("name", "unknown"), tool.get("description", ""), params))
+    return tuple(key)
+
+
+def _format_tool_catalog(tools: List[Dict[str, Any]]) -> str:
+    """Render the prompt catalog once per distinct tool set.
+
+    Cached in session state rather than a module-level memo: the page script
+    re-executes on every rerun, so an lru_cache here could never hit. The key
+    only changes when discovery returns a different tool set (reconnect).
+    """
+    tools_key = _tool_catalog_key(tools)
+    cached = st.session_state.get("tool_catalog_cache")
+    if cached is not None and cached[0] == tools_key:
+        return cached[1]
+
+    tool_blocks = []
+    for name, desc, params in tools_key:
+        if params:
+            params_text = "\n".join(
+                f"      - {param_name} ({param_type}): {param_desc}"
+                for param_name, param_type, param_desc in params
+            )
+        else:
+            params_text = "      - None"
+        tool_blocks.append(f"- Name: {name}\n  Description: {desc}\n  Parameters:\n{params_text}")
+
+    rendered = "\n".join(tool_blocks) if tool_blocks else "No tools are currently available."
+    st.session_state.tool_catalog_cache = (tools_key, rendered)
+    return rendered
+
+
 def plan_tool_with_llm(
     user_request: str,
     tools: List[Dict[str, Any]],
     api_key: str,
     required_tool_name: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Ask the LLM which tool to call and with which arguments."""
-    client = OpenAI(api_key=api_key)
+    """Ask the LLM which tool to call and with which arguments.
 
-    tool_blocks = []
-    for tool in tools:
-        name = tool.get("name", "unknown")
-        desc = tool.get("description", "")
-        schema = tool.get("inputSchema", {})
-        properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
-        if properties:
-            param_lines = []
-            for param_name, param_info in properties.items():
-                param_type = param_info.get("type", "string")
-                param_desc = param_info.get("description", "")
-                param_lines.append(f"      - {param_name} ({param_type}): {param_desc}")
-            params_text = "\n".join(param_lines)
-        else:
-            params_text = "      - None"
-        tool_blocks.append(f"- Name: {name}\n  Description: {desc}\n  Parameters:\n{params_text}")
+    The same round-trip also yields a ``response_template`` containing a
+    ``{{tool_output}}`` placeholder, so the tool result can be interpolated
+    locally instead of paying a second compose call.
+    """
+    client = _openai_client(api_key)
 
-    tool_catalog = "\n".join(tool_blocks) if tool_blocks else "No tools are currently available."
+    tool_catalog = _format_tool_catalog(tools)
 
     instruction_line = (
         f"You must call the file-reading tool named '{required_tool_name}' and supply its required arguments. "
@@ -209,6 +302,7 @@ Respond with a single JSON object containing:
 - "tool_name": string or null
 - "arguments": object (use {{}} if no arguments or no tool)
 - "reasoning": short explanation
+- "response_template": the complete reply to show the user: exactly 50 words (no more, no less) summarising the topic, then the literal placeholder {{{{tool_output}}}} on its own line where the tool result belongs
 
 Return JSON only, no additional commentary.
 """
@@ -254,25 +348,42 @@ Return JSON only, no additional commentary.
 
     reasoning = plan_data.get("reasoning", "")
 
+    response_template = plan_data.get("response_template")
+    if not isinstance(response_template, str) or "{{tool_output}}" not in response_template:
+        response_template = None
+
     plan_data["tool_name"] = tool_name
     plan_data["arguments"] = arguments
     plan_data["reasoning"] = reasoning
+    plan_data["response_template"] = response_template
     return plan_data
 
 
-def compose_final_response(
+def compose_final_response_stream(
     user_request: str,
     tool_name: Optional[str],
     tool_output: str,
     reasoning: str,
     api_key: str,
-) -> str:
-    """Compose the final answer for the user, using tool output if available."""
-    client = OpenAI(api_key=api_key)
+    output_pending: bool = False,
+) -> Iterator[str]:
+    """Stream the final answer for the user, yielding text deltas as they arrive.
+
+    Designed for `st.write_stream`, so the UI shows tokens at time-to-first-token
+    rather than blocking on the whole completion. When ``output_pending`` is True
+    the tool call is still in flight; the LLM is told the output will be appended
+    verbatim so the compose round-trip can overlap with the tool invocation.
+    """
+    client = _openai_client(api_key)
 
     context_parts = [f"User request: {user_request}"]
     if tool_name and tool_output:
         context_parts.append(f"Tool '{tool_name}' output:\n{tool_output}")
+    elif tool_name and output_pending:
+        context_parts.append(
+            f"Tool '{tool_name}' is being invoked right now; its output will be "
+            "appended verbatim below your summary."
+        )
     elif tool_name:
         context_parts.append(f"Tool '{tool_name}' returned no content.")
     if reasoning:
@@ -287,31 +398,113 @@ def compose_final_response(
     )
 
     try:
-        response = client.responses.create(
+        with client.responses.stream(
             model="gpt-4.1-mini",
             input=prompt,
-        )
-        summary_text = response.output_text.strip()
+        ) as stream:
+            for event in stream:
+                if event.type == "response.output_text.delta":
+                    yield event.delta
     except Exception as error:
         fallback = user_request
         if tool_output:
             fallback += f"\n\nTool '{tool_name}' output:\n{tool_output}"
         fallback += f"\n\n(Note: failed to contact language model: {error})"
-        return fallback
+        yield fallback
+        return
 
     if tool_output:
-        summary_text = (
-            f"{summary_text}\n\n"
-            f"--- File Content ({tool_name or 'tool'}) ---\n"
+        yield (
+            f"\n\n--- File Content ({tool_name or 'tool'}) ---\n"
             f"{tool_output}"
         )
 
-    return summary_text
+@st.fragment
+def _render_tool_expander(idx: int, tool: Dict[str, Any]) -> None:
+    """Render one tool expander; interactions rerun only this fragment."""
+    tool_name = tool.get("name", f"Tool {idx + 1}")
+    tool_desc = tool.get("description", "No description provided.")
+    schema = tool.get("inputSchema") or {}
+    properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
+    required_params = schema.get("required", []) if isinstance(schema, dict) else []
+
+    with st.expander(f"📋 {tool_name}", expanded=False):
+        st.write("**Description:**")
+        st.info(tool_desc)
+
+        if properties:
+            st.write("**Parameters:**")
+            lines = []
+            for param_name, param_info in properties.items():
+                param_type = param_info.get("type", "string")
+                param_desc = param_info.get("description", "")
+                required_flag = " (required)" if param_name in required_params else ""
+                lines.append(f"- `{param_name}` ({param_type}){required_flag}: {param_desc}")
+            st.markdown("\n".join(lines))
+        else:
+            st.write("**Parameters:** None")
+
+        if st.checkbox(f"Show raw schema for {tool_name}", key=f"schema_{idx}"):
+            st.json(tool)
+
+
+@st.fragment
+def _render_history_entry(idx: int, run: AgentRun) -> None:
+    """Render one history entry; interactions rerun only this fragment."""
+    title = f"Run {idx + 1}: {run.request}"
+    if run.timestamp:
+        title += f" ({run.timestamp})"
+    with st.expander(title, expanded=(idx == 0)):
+        st.markdown("**Agent Response**")
+        st.write(run.final_response)
+
+        if run.tool_error:
+            st.error(run.tool_error)
+
+        tool_result = run.tool_result
+        if tool_result:
+            st.markdown("**Tool Output**")
+            st.text_area(
+                "Output content",
+                value=tool_result.get("content", ""),
+                height=180,
+                key=f"history_output_{idx}",
+                disabled=True,
+            )
+            raw_payload = tool_result.get("raw")
+            if raw_payload is not None:
+                st.markdown("**Raw Result**")
+                payload_content = getattr(raw_payload, "data", raw_payload)
+                try:
+                    # Pre-serialize with orjson; st.json's pretty-printer is
+                    # slow on large payloads.
+                    st.code(
+                        orjson.dumps(payload_content, option=orjson.OPT_INDENT_2).decode(),
+                        language="json",
+                    )
+                except Exception:
+                    st.write(str(payload_content))
+
+        if run.arguments_used:
+            st.markdown("**Tool Arguments Used**")
+            st.json(run.arguments_used)
+
+        st.markdown("**Tool Plan**")
+        st.json(run.plan)
+
+        st.download_button(
+            "Download response",
+            data=run.final_response,
+            file_name=f"agent_response_{idx + 1}.txt",
+            mime="text/plain",
+            key=f"download_history_{idx}",
+        )
+
 
 # Main UI
 st.title("✨ MCP Agent Playground")
 st.markdown(
-    "Describe your goal and let the agent decide which MCP tool to invoke over the SSE transport. "
+    "Describe your goal and let the agent decide which MCP tool to invoke. "
     "It will then compose a concise answer that incorporates any data returned by the tool."
 )
 
@@ -328,11 +521,14 @@ with st.sidebar:
     st.divider()
     st.header("MCP Server")
 
-    default_value = st.session_state.get("mcp_server_url") or "http://localhost:8766/sse"
+    default_value = st.session_state.get("mcp_server_url") or "http://localhost:8766/mcp"
     mcp_server_url = st.text_input(
-        "MCP SSE URL",
+        "MCP Server URL",
         value=default_value,
-        help="SSE endpoint exposed by FastMCP, e.g. http://localhost:8766/sse",
+        help=(
+            "Endpoint exposed by FastMCP. Use http://localhost:8766/mcp for "
+            "Streamable HTTP (recommended) or .../sse for the SSE transport."
+        ),
     )
 
     if st.button("🔌 Connect to MCP Server"):
@@ -352,11 +548,22 @@ with st.sidebar:
         for tool in st.session_state.available_tools:
             st.write(f"- {tool.get('name', 'Unknown')}")
 
+    st.divider()
+    st.checkbox(
+        "Keep raw tool payloads in history",
+        value=False,
+        key="keep_raw_payloads",
+        help=(
+            "Raw payloads can be large and are pickled into session state on "
+            "every rerun; leave this off unless you need them for debugging."
+        ),
+    )
+
 # Agent request
 user_request = st.text_area(
     "What should the agent do?",
     placeholder="Summarize the content of sample.txt and relate it to AI ethics.",
-    help="The agent will decide which MCP tool to call over the SSE transport.",
+    help="The agent will decide which MCP tool to call on the configured server.",
 )
 
 run_agent_clicked = st.button(
@@ -381,59 +588,144 @@ if run_agent_clicked:
                 tools = st.session_state.available_tools or discover_tools(client)
                 read_tool = find_read_tool(tools)
                 required_tool_name = read_tool.get("name") if read_tool else None
-                plan = plan_tool_with_llm(
-                    user_request,
-                    tools,
-                    api_key,
-                    required_tool_name=required_tool_name,
-                )
+
+                # When the read tool is forced anyway and all of its required
+                # arguments resolve from defaults, the planner round-trip would
+                # only echo that decision back - skip it.
+                plan = None
+                if required_tool_name:
+                    try:
+                        prepare_tool_arguments(read_tool, {})
+                    except ValueError:
+                        pass
+                    else:
+                        plan = {
+                            "tool_name": required_tool_name,
+                            "arguments": {},
+                            "reasoning": f"'{required_tool_name}' is the designated read tool; planner skipped.",
+                        }
+
+                if plan is None:
+                    plan = plan_tool_with_llm(
+                        user_request,
+                        tools,
+                        api_key,
+                        required_tool_name=required_tool_name,
+                    )
 
                 tool_result = None
                 tool_error = None
                 tool_output_text = ""
+                final_response: Optional[str] = None
+                speculative_summary: Optional[str] = None
                 arguments_used: Dict[str, Any] = {}
 
                 tool_name = plan.get("tool_name")
                 if tool_name:
-                    available_names = {tool.get("name") for tool in tools if tool.get("name")}
-                    if tool_name not in available_names:
+                    tools_by_name = st.session_state.tools_by_name or {
+                        tool["name"]: tool for tool in tools if tool.get("name")
+                    }
+                    if tool_name not in tools_by_name:
                         tool_error = f"Tool '{tool_name}' is not available."
                         plan["tool_name"] = None
                     else:
-                        target_tool = next((tool for tool in tools if tool.get("name") == tool_name), None)
+                        target_tool = tools_by_name[tool_name]
                         try:
                             arguments_used = prepare_tool_arguments(target_tool, plan.get("arguments", {}))
                         except ValueError as error:
                             tool_error = str(error)
                             plan["tool_name"] = None
                         else:
-                            call_result = call_mcp_tool(client, tool_name, arguments_used)
-                            if call_result.get("success"):
-                                tool_result = call_result
-                                tool_output_text = call_result.get("content", "")
+                            if plan.get("response_template"):
+                                # The planner round-trip already produced the
+                                # final reply as a template; interpolate the
+                                # tool output locally instead of paying a
+                                # compose call.
+                                call_result = call_mcp_tool(client, tool_name, arguments_used)
+                                if call_result.get("success"):
+                                    tool_result = call_result
+                                    tool_output_text = call_result.get("content", "")
+                                    final_response = plan["response_template"].replace(
+                                        "{{tool_output}}", tool_output_text
+                                    ).strip()
+                                    st.write(final_response)
+                                else:
+                                    tool_error = call_result.get("error") or "Unknown error while invoking the tool."
                             else:
-                                tool_error = call_result.get("error") or "Unknown error while invoking the tool."
-
-                final_response = compose_final_response(
-                    user_request=user_request,
-                    tool_name=plan.get("tool_name"),
-                    tool_output=tool_output_text,
-                    reasoning=plan.get("reasoning", ""),
-                    api_key=api_key,
-                )
+                                # Overlap the MCP tool call with the compose
+                                # stream: the summary only depends on the
+                                # request and the plan reasoning, and the tool
+                                # output is appended verbatim. The stream lands
+                                # in a placeholder so it can be cleared if the
+                                # tool call fails after the fact.
+                                speculative_slot = st.empty()
+                                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+                                    tool_future = pool.submit(call_mcp_tool, client, tool_name, arguments_used)
+                                    with speculative_slot.container():
+                                        speculative_summary = str(
+                                            st.write_stream(
+                                                compose_final_response_stream(
+                                                    user_request,
+                                                    tool_name,
+                                                    "",
+                                                    plan.get("reasoning", ""),
+                                                    api_key,
+                                                    output_pending=True,
+                                                )
+                                            )
+                                        ).strip()
+                                    call_result = tool_future.result()
+                                if call_result.get("success"):
+                                    tool_result = call_result
+                                    tool_output_text = call_result.get("content", "")
+                                else:
+                                    tool_error = call_result.get("error") or "Unknown error while invoking the tool."
+                                    # The speculative summary assumed the tool
+                                    # would succeed; pull it off the page and
+                                    # recompose with the failure context so the
+                                    # user doesn't see two stacked answers.
+                                    speculative_summary = None
+                                    speculative_slot.empty()
+
+                if final_response is not None:
+                    pass
+                elif speculative_summary is not None:
+                    final_response = speculative_summary
+                    if tool_output_text:
+                        final_response = (
+                            f"{speculative_summary}\n\n"
+                            f"--- File Content ({plan.get('tool_name') or 'tool'}) ---\n"
+                            f"{tool_output_text}"
+                        )
+                else:
+                    final_response = str(
+                        st.write_stream(
+                            compose_final_response_stream(
+                                user_request,
+                                plan.get("tool_name"),
+                                tool_output_text,
+                                plan.get("reasoning", ""),
+                                api_key,
+                            )
+                        )
+                    ).strip()
+
+                # Raw payloads can hold megabytes across ten runs and are only
+                # rendered on demand; keep history O(text) unless opted in.
+                if tool_result is not None and not st.session_state.get("keep_raw_payloads"):
+                    tool_result = {key: value for key, value in tool_result.items() if key != "raw"}
 
                 st.session_state.generated_content = final_response
-                entry = {
-                    "timestamp": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                    "request": user_request,
-                    "plan": plan,
-                    "arguments_used": arguments_used,
-                    "tool_result": tool_result,
-                    "tool_error": tool_error,
-                    "final_response": final_response,
-                }
-                st.session_state.agent_history.insert(0, entry)
-                st.session_state.agent_history = st.session_state.agent_history[:10]
+                entry = AgentRun(
+                    timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+                    request=user_request,
+                    plan=plan,
+                    arguments_used=arguments_used,
+                    final_response=final_response,
+                    tool_result=tool_result,
+                    tool_error=tool_error,
+                )
+                st.session_state.agent_history.appendleft(entry)
                 st.success("Agent run completed!")
 
 if st.session_state.generated_content:
@@ -454,76 +746,11 @@ if st.session_state.mcp_connected and st.session_state.available_tools:
     st.markdown(f"**Total Tools Available:** {len(st.session_state.available_tools)}")
 
     for idx, tool in enumerate(st.session_state.available_tools):
-        tool_name = tool.get("name", f"Tool {idx + 1}")
-        tool_desc = tool.get("description", "No description provided.")
-        schema = tool.get("inputSchema") or {}
-        properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
-        required_params = schema.get("required", []) if isinstance(schema, dict) else []
-
-        with st.expander(f"📋 {tool_name}", expanded=False):
-            st.write("**Description:**")
-            st.info(tool_desc)
-
-            if properties:
-                st.write("**Parameters:**")
-                lines = []
-                for param_name, param_info in properties.items():
-                    param_type = param_info.get("type", "string")
-                    param_desc = param_info.get("description", "")
-                    required_flag = " (required)" if param_name in required_params else ""
-                    lines.append(f"- `{param_name}` ({param_type}){required_flag}: {param_desc}")
-                st.markdown("\n".join(lines))
-            else:
-                st.write("**Parameters:** None")
-
-            if st.checkbox(f"Show raw schema for {tool_name}", key=f"schema_{idx}"):
-                st.json(tool)
+        _render_tool_expander(idx, tool)
 
 if st.session_state.agent_history:
     st.divider()
     st.subheader("🧠 Agent Run History")
     for idx, run in enumerate(st.session_state.agent_history):
-        title = f"Run {idx + 1}: {run['request']}"
-        if run.get("timestamp"):
-            title += f" ({run['timestamp']})"
-        with st.expander(title, expanded=(idx == 0)):
-            st.markdown("**Agent Response**")
-            st.write(run["final_response"])
-
-            if run.get("tool_error"):
-                st.error(run["tool_error"])
-
-            tool_result = run.get("tool_result")
-            if tool_result:
-                st.markdown("**Tool Output**")
-                st.text_area(
-                    "Output content",
-                    value=tool_result.get("content", ""),
-                    height=180,
-                    key=f"history_output_{idx}",
-                    disabled=True,
-                )
-                raw_payload = tool_result.get("raw")
-                if raw_payload is not None:
-                    st.markdown("**Raw Result**")
-                    payload_content = getattr(raw_payload, "data", raw_payload)
-                    try:
-                        st.json(payload_content)
-                    except Exception:
-                        st.write(str(payload_content))
-
-            if run.get("arguments_used"):
-                st.markdown("**Tool Arguments Used**")
-                st.json(run["arguments_used"])
-
-            st.markdown("**Tool Plan**")
-            st.json(run["plan"])
-
-            st.download_button(
-                "Download response",
-                data=run["final_response"],
-                file_name=f"agent_response_{idx + 1}.txt",
-                mime="text/plain",
-                key=f"download_history_{idx}",
-            )
+        _render_history_entry(idx, run)
 
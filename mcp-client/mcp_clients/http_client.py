@@ -3,14 +3,25 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
-from .utils import normalize_http_base, normalize_tool_result
+from .utils import EMPTY_PARAMS, normalize_http_base, normalize_tool_result
 
-import requests
+import httpx
+import orjson
+
+# Tool names probed by `read_file`, in preference order.
+_READ_FILE_CANDIDATES = ("read_file", "readfile", "read_file_mcp")
 
 
 class MCPHttpClient:
-    """Operate through FastMCP's HTTP shim endpoints (non-spec transport)."""
+    """MCP client over plain HTTP.
+
+    URLs that carry a path (e.g. ``http://host:8766/mcp``) are treated as a
+    stateless streamable-HTTP endpoint and spoken to with JSON-RPC 2.0
+    envelopes — this is what the bundled server exposes. Bare host URLs fall
+    back to probing FastMCP's REST shim endpoints (non-spec transport).
+    """
 
     def __init__(self, base_url: str) -> None:
         http_base = normalize_http_base(base_url)
@@ -18,26 +29,57 @@ class MCPHttpClient:
             raise ValueError("Base URL must be provided")
 
         self.base_url = http_base
-        self.session = requests.Session()
+        # normalize_http_base strips the path; keep it so /mcp-style endpoints
+        # get real JSON-RPC instead of the shim-probing ladder.
+        raw = base_url if "://" in base_url else f"http://{base_url}"
+        path = urlparse(raw).path.rstrip("/")
+        self._rpc_url: Optional[str] = f"{http_base}{path}" if path else None
+        self._rpc_id = 0
+        # HTTP/2 multiplexing plus keep-alive avoids head-of-line blocking on
+        # the endpoint-probing ladder in `call_tool`.
+        self.session = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10),
+            timeout=10.0,
+        )
         self.tools_cache: Dict[str, Any] = {}
+        self._read_file_tool: Optional[str] = None
         self.connected = False
+        # Learned winners so steady-state calls skip the probing ladders.
+        self._tool_endpoint_cache: Dict[str, Tuple[str, str]] = {}
+        self._discovery_endpoint: Optional[Tuple[str, str]] = None
+        # Conditional-GET validators for the discovery endpoint; a 304 lets us
+        # reuse tools_cache without re-parsing the tool list.
+        self._discovery_validators: Dict[str, str] = {}
 
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
     def connect(self) -> None:
+        if self.connected:
+            return
+        # Prime the keep-alive pool with a cheap HEAD so the first real tool
+        # call rides the already-negotiated connection. Status codes do not
+        # matter here (404/405 still establish the connection); transport
+        # errors propagate so callers fail fast.
+        self.session.head(self.base_url, timeout=5)
         self.connected = True
 
     def close(self) -> None:
         self.session.close()
         self.connected = False
 
+    def __enter__(self) -> "MCPHttpClient":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
     # ------------------------------------------------------------------
     # Discovery
     # ------------------------------------------------------------------
     def discover_tools(self) -> List[Dict[str, Any]]:
-        self.connect()
-
         tools_map: Dict[str, Dict[str, Any]] = {}
         try:
             tools_via_rpc = self._discover_from_mcp_endpoint()
@@ -45,27 +87,51 @@ class MCPHttpClient:
                 name = tool.get("name")
                 if not name:
                     continue
-                merged = dict(tool)
-                merged.setdefault("inputSchema", {"type": "object", "properties": {}, "required": []})
-                tools_map[name] = merged
+                # Discovery hands back freshly parsed dicts, so mutate in
+                # place instead of copying each one.
+                tool.setdefault("inputSchema", {"type": "object", "properties": {}, "required": []})
+                tools_map[name] = tool
         except Exception as error:
             print(f"⚠️  MCP tools/list via HTTP failed: {error}")
 
         tools = list(tools_map.values())
         self.tools_cache = {tool["name"]: tool for tool in tools if tool.get("name")}
+        # Resolve the read tool once per discovery so read_file skips lookup.
+        self._read_file_tool = next(
+            (name for name in _READ_FILE_CANDIDATES if name in self.tools_cache), None
+        )
         return tools
 
     def _discover_from_mcp_endpoint(self) -> List[Dict[str, Any]]:
+        if self._rpc_url is not None:
+            try:
+                return self._discover_via_jsonrpc()
+            except Exception:
+                # Endpoint exists but doesn't speak streamable HTTP; fall back
+                # to the shim-probing ladder below.
+                pass
+
         endpoints_to_try = [
             ("POST", "mcp/tools/list", {}),
             ("POST", "tools/list", {"method": "tools/list"}),
             ("GET", "mcp/tools/list", None),
             ("GET", "tools/list", None),
         ]
+        if self._discovery_endpoint is not None:
+            endpoints_to_try.sort(key=lambda entry: entry[:2] != self._discovery_endpoint)
 
         for method, endpoint, payload in endpoints_to_try:
             try:
-                result = self._send_http_request(endpoint, payload, method)
+                headers = (
+                    self._discovery_validators
+                    if self._discovery_validators and self._discovery_endpoint == (method, endpoint)
+                    else None
+                )
+                response = self._request(endpoint, payload, method, headers=headers)
+                if response.status_code == 304 and self.tools_cache:
+                    return list(self.tools_cache.values())
+                response.raise_for_status()
+                result = self._parse_response(response)
                 tools: List[Any] = []
                 if isinstance(result, dict):
                     tools = (
@@ -79,25 +145,58 @@ class MCPHttpClient:
                     tools = result
 
                 cleaned: List[Dict[str, Any]] = [
-                    dict(tool)
+                    tool
                     for tool in tools
                     if isinstance(tool, dict) and tool.get("name")
                 ]
                 if cleaned:
                     for entry in cleaned:
                         entry.setdefault("inputSchema", {"type": "object", "properties": {}, "required": []})
+                    self._discovery_endpoint = (method, endpoint)
+                    validators: Dict[str, str] = {}
+                    etag = response.headers.get("etag")
+                    if etag:
+                        validators["If-None-Match"] = etag
+                    last_modified = response.headers.get("last-modified")
+                    if last_modified:
+                        validators["If-Modified-Since"] = last_modified
+                    self._discovery_validators = validators
                     return cleaned
             except Exception:
                 continue
 
         return []
 
+    def _discover_via_jsonrpc(self) -> List[Dict[str, Any]]:
+        tools: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            params: Dict[str, Any] = {"cursor": cursor} if cursor else {}
+            result = self._rpc("tools/list", params)
+            tools.extend(
+                tool for tool in result.get("tools", [])
+                if isinstance(tool, dict) and tool.get("name")
+            )
+            cursor = result.get("nextCursor")
+            if not cursor:
+                break
+        for tool in tools:
+            tool.setdefault("inputSchema", {"type": "object", "properties": {}, "required": []})
+        return tools
+
     # ------------------------------------------------------------------
     # Invocation
     # ------------------------------------------------------------------
     def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        self.connect()
-        arguments = arguments or {}
+        arguments = arguments or EMPTY_PARAMS
+
+        last_error: Optional[str] = None
+        if self._rpc_url is not None:
+            try:
+                result = self._rpc("tools/call", {"name": tool_name, "arguments": arguments})
+                return normalize_tool_result(result)
+            except Exception as error:
+                last_error = str(error)
 
         endpoints: List[Tuple[str, Dict[str, Any], str]] = []
         endpoints.extend(
@@ -110,11 +209,14 @@ class MCPHttpClient:
                 (f"mcp/{tool_name}", arguments, "POST"),
             ]
         )
+        cached = self._tool_endpoint_cache.get(tool_name)
+        if cached is not None:
+            endpoints.sort(key=lambda entry: (entry[0], entry[2]) != cached)
 
-        last_error: Optional[str] = None
         for endpoint, payload, method in endpoints:
             try:
                 result = self._send_http_request(endpoint, payload, method)
+                self._tool_endpoint_cache[tool_name] = (endpoint, method)
                 return normalize_tool_result(result)
             except Exception as error:
                 last_error = str(error)
@@ -123,30 +225,92 @@ class MCPHttpClient:
         raise Exception(f"Could not call tool '{tool_name}' via HTTP. Last error: {last_error}")
 
     def read_file(self, file_path: str) -> str:
-        for candidate in ("read_file", "readfile", "read_file_mcp"):
-            if candidate in self.tools_cache:
-                result = self.call_tool(candidate, {"path": file_path})
-                return result.get("content", "")
-        return f"No read_file tool available on {self.base_url}"
+        candidate = self._read_file_tool or next(
+            (name for name in _READ_FILE_CANDIDATES if name in self.tools_cache), None
+        )
+        if candidate is None:
+            return f"No read_file tool available on {self.base_url}"
+        self._read_file_tool = candidate
+        result = self.call_tool(candidate, {"path": file_path})
+        return result.get("content", "")
 
     # ------------------------------------------------------------------
     # Internal helper
     # ------------------------------------------------------------------
-    def _send_http_request(
+    def _rpc(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send one JSON-RPC 2.0 request to the streamable-HTTP endpoint.
+
+        The bundled server runs with stateless_http enabled, so no initialize
+        handshake or session header is required. Depending on negotiation the
+        reply arrives either as plain JSON or as a single-event SSE body.
+        """
+        assert self._rpc_url is not None
+        self._rpc_id += 1
+        envelope = {
+            "jsonrpc": "2.0",
+            "id": self._rpc_id,
+            "method": method,
+            "params": params or EMPTY_PARAMS,
+        }
+        response = self.session.post(
+            self._rpc_url,
+            content=orjson.dumps(envelope),
+            headers={
+                "content-type": "application/json",
+                # Streamable HTTP servers require both media types here.
+                "accept": "application/json, text/event-stream",
+            },
+        )
+        response.raise_for_status()
+        data = self._parse_rpc_body(response)
+        if "error" in data:
+            raise Exception(data["error"])
+        return data.get("result", {})
+
+    @staticmethod
+    def _parse_rpc_body(response: httpx.Response) -> Dict[str, Any]:
+        if "text/event-stream" in response.headers.get("content-type", "").lower():
+            for line in response.text.splitlines():
+                if line.startswith("data:"):
+                    payload = orjson.loads(line[5:].strip())
+                    if isinstance(payload, dict) and "id" in payload:
+                        return payload
+            raise Exception("No JSON-RPC response in event stream")
+        return orjson.loads(response.content)
+
+    def _request(
         self,
         endpoint: str,
         payload: Optional[Dict[str, Any]] = None,
         method: str = "POST",
-    ) -> Dict[str, Any]:
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        method_upper = method.upper()
-        if method_upper == "GET":
-            response = self.session.get(url, params=payload, timeout=10)
-        else:
-            response = self.session.post(url, json=payload, timeout=10)
-        response.raise_for_status()
+        if method.upper() == "GET":
+            return self.session.get(url, params=payload, headers=headers)
+        if payload is None:
+            return self.session.post(url, headers=headers)
+        # Serialize with orjson and send raw bytes; httpx's json= path would
+        # go through stdlib json and an intermediate str.
+        post_headers = {"content-type": "application/json"}
+        if headers:
+            post_headers.update(headers)
+        return self.session.post(url, content=orjson.dumps(payload), headers=post_headers)
 
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Dict[str, Any]:
         content_type = response.headers.get("content-type", "").lower()
         if "application/json" in content_type:
-            return response.json()
+            # bytes -> dict directly, skipping the utf-8 str intermediate.
+            return orjson.loads(response.content)
         return {"content": response.text}
+
+    def _send_http_request(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]] = None,
+        method: str = "POST",
+    ) -> Dict[str, Any]:
+        response = self._request(endpoint, payload, method)
+        response.raise_for_status()
+        return self._parse_response(response)
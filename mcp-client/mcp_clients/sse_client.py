@@ -3,13 +3,54 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import hashlib
+import json
+import sys
 import threading
+import time
+from pathlib import Path
 from typing import Any, Awaitable, Dict, List, Optional
 
 from fastmcp import Client as FastMCPClient
 from mcp.types import Implementation
+from pydantic import TypeAdapter
 
-from .utils import normalize_tool_result
+from .utils import EMPTY_PARAMS, normalize_tool_result
+
+try:
+    from platformdirs import user_cache_dir
+except ImportError:  # pragma: no cover - ~/.cache fallback below
+    user_cache_dir = None  # type: ignore[assignment]
+
+# Tool names probed by `read_file`, in preference order.
+_READ_FILE_CANDIDATES = ("read_file", "readfile", "read_file_mcp")
+
+# How long a discovered tool list stays fresh. Tool registration rarely
+# changes mid-session, and list_tools already carries each tool's schema and
+# description, so refreshing the whole list covers per-tool metadata too.
+_TOOLS_TTL_SECONDS = 60.0
+
+# On-disk tool-list cache shared across client instances and process runs, so
+# an app reload skips the handshake + list_tools round-trip entirely.
+_DISK_TTL_SECONDS = 300.0
+_DISK_CACHE_VERSION = 1
+
+
+def _disk_cache_dir() -> Path:
+    if user_cache_dir is not None:
+        return Path(user_cache_dir("mcp-client"))
+    return Path.home() / ".cache" / "mcp-client"
+
+# Built lazily from the first tool batch; dump_python amortizes pydantic's
+# schema lookup across the whole list instead of one reflective walk per tool.
+_tools_adapter: Optional[TypeAdapter] = None
+
+
+def _default_schema() -> Dict[str, Any]:
+    # Fresh instance per tool; a shared module-level dict would leak mutations
+    # between tools.
+    return {"type": "object", "properties": {}, "required": []}
 
 
 class MCPSSEClient:
@@ -17,8 +58,11 @@ class MCPSSEClient:
     Thin synchronous wrapper around fastmcp.Client using the SSE transport.
 
     The underlying fastmcp client speaks MCP JSON-RPC 2.0 and handles
-    connection management. We run it on a background asyncio loop so the rest of
-    the application can remain synchronous.
+    connection management. By default we run it on a background asyncio loop so
+    the rest of the application can remain synchronous while the session stays
+    warm across calls. Pass ``background_loop=False`` for one-shot callers
+    (CLI scripts making one or two calls): no thread or persistent loop is
+    created and each call opens its own session via ``asyncio.run``.
     """
 
     def __init__(
@@ -26,6 +70,8 @@ class MCPSSEClient:
         server_url: str,
         client_name: str = "Streamlit MCP Client",
         client_version: str = "0.1.0",
+        background_loop: bool = True,
+        prefetch: bool = True,
     ) -> None:
         if not server_url:
             raise ValueError("Server URL must be provided")
@@ -33,32 +79,71 @@ class MCPSSEClient:
         self.server_url = server_url
         self.client_name = client_name
         self.client_version = client_version
+        self._background_loop = background_loop
 
-        self._loop = asyncio.new_event_loop()
-        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
-        self._loop_thread.start()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        if background_loop:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
+            if sys.version_info >= (3, 12):
+                # Eager tasks run until their first real await without a
+                # scheduler pass, so RPCs whose responses are already buffered
+                # skip a loop tick entirely.
+                self._loop.call_soon_threadsafe(self._loop.set_task_factory, asyncio.eager_task_factory)
 
         self._client_ctx: Optional[FastMCPClient] = None
         self._client: Optional[FastMCPClient] = None
 
         self.tools_cache: Dict[str, Any] = {}
+        self._read_file_tool: Optional[str] = None
         self.connected = False
 
+        # Stale-while-revalidate tool-list cache: within the TTL discovery is
+        # free; past it, a background refresh is kicked off while the caller
+        # keeps the previous list. `prefetch=False` disables the refresh.
+        self._prefetch = prefetch
+        self._tools_serialized: List[Dict[str, Any]] = []
+        self._tools_fetched_at = 0.0
+        self._refresh_inflight = False
+        # True while tools_cache came from disk rather than the live server;
+        # a call failure then invalidates the disk entry instead of trusting it.
+        self._tools_from_disk = False
+
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
     def connect(self) -> None:
         if self.connected:
             return
+        if not self._background_loop:
+            # One-shot mode opens a fresh session per call; nothing to keep
+            # alive here.
+            self.connected = True
+            return
         self._run(self._async_connect())
         self.connected = True
 
+    async def aconnect(self) -> None:
+        """Async sibling of `connect` for callers already inside a loop."""
+        if self.connected:
+            return
+        if not self._background_loop:
+            self.connected = True
+            return
+        await asyncio.wrap_future(self._submit(self._async_connect()))
+        self.connected = True
+
     def close(self) -> None:
         if not self.connected:
             return
-        self._run(self._async_close())
+        if self._background_loop:
+            self._run(self._async_close())
         self.connected = False
         self.tools_cache.clear()
+        self._tools_serialized = []
+        self._tools_fetched_at = 0.0
 
     async def _async_connect(self) -> None:
         client_info = Implementation(name=self.client_name, version=self.client_version)
@@ -71,50 +156,270 @@ class MCPSSEClient:
         self._client_ctx = None
         self._client = None
 
+    async def _oneshot(self, action) -> Any:
+        """Open a session, run `action(client)`, and tear the session down."""
+        client_info = Implementation(name=self.client_name, version=self.client_version)
+        async with FastMCPClient(self.server_url, client_info=client_info) as client:
+            return await action(client)
+
     # ------------------------------------------------------------------
     # Discovery
     # ------------------------------------------------------------------
     def discover_tools(self) -> List[Dict[str, Any]]:
-        self.connect()
+        cached = self._cached_tools()
+        if cached is not None:
+            return cached
+
+        if not self._background_loop:
+            tools = asyncio.run(self._oneshot(lambda client: client.list_tools()))
+            return self._serialize_tools(tools)
+
+        # Inline the connected check and bind the client to a local so the
+        # steady state skips a call frame and repeated attribute loads.
+        if not self.connected:
+            self.connect()
+        client = self._client
+        assert client is not None
+
+        tools = self._run(client.list_tools())
+        return self._serialize_tools(tools)
+
+    async def adiscover_tools(self) -> List[Dict[str, Any]]:
+        """Async sibling of `discover_tools`."""
+        cached = self._cached_tools()
+        if cached is not None:
+            return cached
+
+        if not self._background_loop:
+            tools = await self._oneshot(lambda client: client.list_tools())
+            return self._serialize_tools(tools)
+
+        if not self.connected:
+            await self.aconnect()
+        client = self._client
+        assert client is not None
+
+        tools = await asyncio.wrap_future(self._submit(client.list_tools()))
+        return self._serialize_tools(tools)
+
+    def _cached_tools(self) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached tool list if usable, refreshing in background.
+
+        Fresh entries (within the TTL) are returned as-is. Stale entries are
+        still returned, but a fire-and-forget refresh is scheduled so the next
+        discovery sees current data — the caller never waits on the RPC.
+        """
+        if self._tools_serialized:
+            if time.monotonic() - self._tools_fetched_at < _TOOLS_TTL_SECONDS:
+                return self._tools_serialized
+            if self._prefetch and self._background_loop:
+                self._refresh_tools_in_background()
+                return self._tools_serialized
+            return None
+
+        disk = self._load_disk_cache()
+        if disk is not None:
+            self._adopt_cached_tools(disk)
+            self._tools_from_disk = True
+            if self._prefetch and self._background_loop:
+                # Verify the disk entry against the live server off-path.
+                self._refresh_tools_in_background()
+            return self._tools_serialized
+        return None
+
+    def _refresh_tools_in_background(self) -> None:
+        if self._refresh_inflight:
+            return
+        self._refresh_inflight = True
+
+        def _store(future: "concurrent.futures.Future[Any]") -> None:
+            self._refresh_inflight = False
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._serialize_tools(future.result())
+
+        self._submit(self._async_list_tools()).add_done_callback(_store)
+
+    async def _async_list_tools(self) -> List[Any]:
+        if self._client is None:
+            await self._async_connect()
+            self.connected = True
         assert self._client is not None
+        return await self._client.list_tools()
+
+    def _serialize_tools(self, tools: List[Any]) -> List[Dict[str, Any]]:
+        global _tools_adapter
+
+        dumped: List[Dict[str, Any]] = []
+        if tools:
+            if _tools_adapter is None:
+                _tools_adapter = TypeAdapter(List[type(tools[0])])
+            dumped = _tools_adapter.dump_python(tools)
 
-        tools = self._run(self._client.list_tools())
         serialized: List[Dict[str, Any]] = []
-        for tool in tools:
-            tool_dict = tool.model_dump()
-            if tool_dict.get("name"):
-                tool_dict.setdefault("inputSchema", {"type": "object", "properties": {}, "required": []})
-                serialized.append(tool_dict)
+        cache: Dict[str, Any] = {}
+        for tool_dict in dumped:
+            name = tool_dict.get("name")
+            if not name:
+                continue
+            tool_dict.setdefault("inputSchema", _default_schema())
+            serialized.append(tool_dict)
+            cache[name] = tool_dict
 
-        self.tools_cache = {tool["name"]: tool for tool in serialized if tool.get("name")}
+        self.tools_cache = cache
+        # Resolve the read tool once per discovery so read_file skips lookup.
+        self._read_file_tool = next(
+            (name for name in _READ_FILE_CANDIDATES if name in self.tools_cache), None
+        )
+        self._tools_serialized = serialized
+        self._tools_fetched_at = time.monotonic()
+        self._tools_from_disk = False
+        self._store_disk_cache(serialized)
         return serialized
 
+    def _adopt_cached_tools(self, serialized: List[Dict[str, Any]]) -> None:
+        """Populate the in-memory caches from already-serialized tool dicts."""
+        cache = {tool["name"]: tool for tool in serialized if tool.get("name")}
+        self.tools_cache = cache
+        self._read_file_tool = next(
+            (name for name in _READ_FILE_CANDIDATES if name in cache), None
+        )
+        self._tools_serialized = serialized
+        self._tools_fetched_at = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Disk cache
+    # ------------------------------------------------------------------
+    def _disk_cache_path(self) -> Path:
+        # hashlib rather than hash(): the built-in is salted per process, so
+        # its values never match across runs.
+        digest = hashlib.sha256(self.server_url.encode()).hexdigest()[:16]
+        return _disk_cache_dir() / f"{digest}.json"
+
+    def _load_disk_cache(self) -> Optional[List[Dict[str, Any]]]:
+        try:
+            payload = json.loads(self._disk_cache_path().read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != _DISK_CACHE_VERSION:
+            return None
+        if time.time() - payload.get("ts", 0) >= _DISK_TTL_SECONDS:
+            return None
+        tools = payload.get("tools")
+        if not isinstance(tools, list) or not tools:
+            return None
+        return tools
+
+    def _store_disk_cache(self, serialized: List[Dict[str, Any]]) -> None:
+        try:
+            path = self._disk_cache_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {"version": _DISK_CACHE_VERSION, "ts": time.time(), "tools": serialized}
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload))
+            tmp.replace(path)
+        except (OSError, TypeError, ValueError):
+            # Best-effort: an unwritable cache dir or a non-JSON-safe schema
+            # must never break discovery.
+            pass
+
+    def _invalidate_disk_cache(self) -> None:
+        try:
+            self._disk_cache_path().unlink()
+        except OSError:
+            pass
+
+    def _note_call_failure(self, tool_name: str) -> None:
+        """Drop a disk-sourced tool list after a failed call against it."""
+        if self._tools_from_disk and tool_name in self.tools_cache:
+            self._tools_from_disk = False
+            self._invalidate_disk_cache()
+            self._tools_serialized = []
+            self._tools_fetched_at = 0.0
+
     # ------------------------------------------------------------------
     # Invocation
     # ------------------------------------------------------------------
     def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        self.connect()
-        assert self._client is not None
+        try:
+            if not self._background_loop:
+                result = asyncio.run(
+                    self._oneshot(lambda client: client.call_tool(tool_name, arguments or EMPTY_PARAMS))
+                )
+                return self._normalize_call(result, tool_name)
+
+            if not self.connected:
+                self.connect()
+            client = self._client
+            assert client is not None
+
+            result = self._run(client.call_tool(tool_name, arguments or EMPTY_PARAMS))
+            return self._normalize_call(result, tool_name)
+        except Exception:
+            self._note_call_failure(tool_name)
+            raise
 
-        result = self._run(self._client.call_tool(tool_name, arguments or {}))
+    async def acall_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async sibling of `call_tool`."""
+        try:
+            if not self._background_loop:
+                result = await self._oneshot(
+                    lambda client: client.call_tool(tool_name, arguments or EMPTY_PARAMS)
+                )
+                return self._normalize_call(result, tool_name)
+
+            if not self.connected:
+                await self.aconnect()
+            client = self._client
+            assert client is not None
+
+            result = await asyncio.wrap_future(
+                self._submit(client.call_tool(tool_name, arguments or EMPTY_PARAMS))
+            )
+            return self._normalize_call(result, tool_name)
+        except Exception:
+            self._note_call_failure(tool_name)
+            raise
+
+    @staticmethod
+    def _normalize_call(result: Any, tool_name: str) -> Dict[str, Any]:
         normalized = normalize_tool_result(result.data)
         normalized["raw"] = result
         normalized["tool"] = tool_name
         return normalized
 
     def read_file(self, file_path: str) -> str:
-        for candidate in ("read_file", "readfile", "read_file_mcp"):
-            if candidate in self.tools_cache:
-                response = self.call_tool(candidate, {"path": file_path})
-                return response.get("content", "")
-        return f"Error: no read_file tool registered on {self.server_url}"
+        candidate = self._read_file_tool or next(
+            (name for name in _READ_FILE_CANDIDATES if name in self.tools_cache), None
+        )
+        if candidate is None:
+            return f"Error: no read_file tool registered on {self.server_url}"
+        self._read_file_tool = candidate
+        response = self.call_tool(candidate, {"path": file_path})
+        return response.get("content", "")
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    def _submit(self, coro: "Awaitable[Any] | asyncio.Future[Any]") -> "concurrent.futures.Future[Any]":
+        """Schedule `coro` on the background loop without blocking."""
+        if self._loop is None:
+            raise RuntimeError("MCPSSEClient was created with background_loop=False")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
     def _run(self, coro: "Awaitable[Any] | asyncio.Future[Any]") -> Any:
-        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        return future.result()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._submit(coro).result()
+        # Blocking on future.result() from inside a running loop would stall
+        # that loop for the whole round-trip; the fastmcp session lives on our
+        # background loop, so async callers get a wrapped cross-loop future
+        # via the a* siblings instead of a blocking hop.
+        raise RuntimeError(
+            "MCPSSEClient sync API called from a running event loop; "
+            "use aconnect/adiscover_tools/acall_tool instead"
+        )
 
     def __del__(self) -> None:
         try:
@@ -122,7 +427,7 @@ class MCPSSEClient:
         except Exception:
             pass
         finally:
-            if self._loop.is_running():
+            if self._loop is not None and self._loop.is_running():
                 self._loop.call_soon_threadsafe(self._loop.stop)
-            if self._loop_thread.is_alive():
+            if self._loop_thread is not None and self._loop_thread.is_alive():
                 self._loop_thread.join(timeout=1)
@@ -3,11 +3,31 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from typing import Any, Dict
 from urllib.parse import urlparse, urlunparse
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None  # type: ignore[assignment]
+
+# Shared sentinel for "no arguments", so arg-less hot-path calls skip a dict
+# allocation each. Never mutate it: callers hand it straight to serializers.
+# A plain dict rather than MappingProxyType because json/orjson refuse to
+# serialize mapping proxies.
+EMPTY_PARAMS: Dict[str, Any] = {}
+
+
 def normalize_http_base(url: str, default_scheme: str = "http") -> str:
     """Convert ws://, wss://, or bare host strings into an HTTP(S) base URL."""
+    return _normalize_http_base_cached(url, default_scheme)
+
+
+@lru_cache(maxsize=256)
+def _normalize_http_base_cached(url: str, default_scheme: str) -> str:
+    # Pure function of its inputs; the same server URL gets normalized on
+    # every Streamlit rerun, so cache the parse.
     parsed = urlparse(url)
     scheme = parsed.scheme
     netloc = parsed.netloc
@@ -35,9 +55,16 @@ def normalize_tool_result(result: Any) -> Dict[str, Any]:
     if isinstance(result, dict):
         content = result.get("content")
         if isinstance(content, list):
-            fragments = [item.get("text", "") for item in content if isinstance(item, dict) and item.get("type") == "text"]
-            if fragments:
-                joined = "\n".join(fragment.strip() for fragment in fragments if fragment)
+            # Single pass over the fragments feeding join directly; no
+            # intermediate fragment list on the hot path.
+            joined = "\n".join(
+                text.strip()
+                for item in content
+                if isinstance(item, dict) and item.get("type") == "text"
+                for text in (item.get("text") or "",)
+                if text
+            )
+            if joined:
                 return {"content": joined, "raw": result}
 
         if isinstance(content, str):
@@ -46,6 +73,8 @@ def normalize_tool_result(result: Any) -> Dict[str, Any]:
         if "message" in result:
             return {"content": str(result["message"]), "raw": result}
 
+        if orjson is not None:
+            return {"content": orjson.dumps(result, option=orjson.OPT_INDENT_2).decode(), "raw": result}
         return {"content": json.dumps(result, indent=2), "raw": result}
 
     if isinstance(result, list):
@@ -3,12 +3,73 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional
+import logging
+import queue
+import socket
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
 
 from websockets.sync.client import connect
 from websockets.exceptions import ConnectionClosed, ConnectionClosedError, ConnectionClosedOK
 
-from .utils import normalize_tool_result
+try:
+    from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory
+except ImportError:  # pragma: no cover - older websockets; default compression
+    ClientPerMessageDeflateFactory = None  # type: ignore[assignment]
+
+from .utils import EMPTY_PARAMS, normalize_tool_result
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None  # type: ignore[assignment]
+
+
+def _dumps(obj: Any) -> "bytes | str":
+    """Serialize an RPC envelope; orjson emits bytes, which send() accepts."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj)
+
+
+def _loads(raw: "bytes | str") -> Any:
+    """Parse an incoming frame; orjson consumes bytes without a utf-8 decode."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _encode_request(request_id: int, method: str, params: Dict[str, Any]) -> "bytes | str":
+    """Build a single JSON-RPC request frame.
+
+    Method names in this client are plain ASCII constants ("initialize",
+    "tools/list", ...), so the envelope can be assembled by bytes
+    concatenation around a serialized params blob instead of dumping a fresh
+    four-key dict per request. Anything that would need escaping falls back
+    to the generic serializer.
+    """
+    if orjson is not None and method.isascii() and '"' not in method and "\\" not in method:
+        return (
+            b'{"jsonrpc":"2.0","id":'
+            + str(request_id).encode()
+            + b',"method":"'
+            + method.encode()
+            + b'","params":'
+            + orjson.dumps(params)
+            + b"}"
+        )
+    return _dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+
+# Tool names probed by `read_file`, in preference order.
+_READ_FILE_CANDIDATES = ("read_file", "readfile", "read_file_mcp")
+
+# tools/list schemas and file-read results can be large; 16 MiB headroom over
+# the library's 1 MiB default avoids dropping the connection on big payloads.
+_MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+_log = logging.getLogger(__name__)
 
 
 class MCPWebSocketClient:
@@ -19,6 +80,7 @@ class MCPWebSocketClient:
         server_url: str,
         client_name: str = "Streamlit MCP Client",
         client_version: str = "0.1.0",
+        stateless: bool = False,
     ) -> None:
         if not server_url:
             raise ValueError("Server URL must be provided")
@@ -28,13 +90,30 @@ class MCPWebSocketClient:
         self.server_url = server_url
         self.client_name = client_name
         self.client_version = client_version
+        # The bundled server runs with stateless_http enabled; against such a
+        # server the initialize RPC establishes no session state and is pure
+        # connect latency, so stateless=True skips it.
+        self._stateless = stateless
 
         self._ws = None  # type: ignore[var-annotated]
         self._request_id = 0
+        # In-flight requests by id; a background reader routes each response
+        # to its caller's future so concurrent RPCs don't serialize on recv.
+        self._pending: Dict[int, "Future[Dict[str, Any]]"] = {}
+        self._pending_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._reader: Optional[threading.Thread] = None
+        # Notifications are coalesced per method (last value wins) and logged
+        # by a consumer thread so a burst cannot starve RPC dispatch.
+        self._notif_queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=1024)
+        self._notif_latest: Dict[str, Dict[str, Any]] = {}
+        self._notif_lock = threading.Lock()
+        self._notif_consumer: Optional[threading.Thread] = None
         self.connected = False
         self.server_info: Dict[str, Any] = {}
         self.capabilities: Dict[str, Any] = {}
         self.tools_cache: Dict[str, Any] = {}
+        self._read_file_tool: Optional[str] = None
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -42,13 +121,48 @@ class MCPWebSocketClient:
     def connect(self) -> None:
         if self.connected:
             return
+        if self._ws is not None:
+            # Reconnecting after a dropped connection: the dead socket and its
+            # reader/consumer threads are still around. Tear them down first
+            # so each drop/reconnect cycle doesn't leak a socket and leave a
+            # consumer thread stuck on queue.get().
+            self.close()
 
-        self._ws = connect(
-            self.server_url,
-            open_timeout=10,
-            close_timeout=10,
-            ping_interval=None,
-        )  # type: ignore[call-arg]
+        connect_kwargs: Dict[str, Any] = {
+            "open_timeout": 10,
+            "close_timeout": 10,
+            "ping_interval": None,
+            "max_size": _MAX_FRAME_SIZE,
+        }
+        if ClientPerMessageDeflateFactory is not None:
+            # permessage-deflate with the full 32 KiB window cuts JSON
+            # payloads several-fold on the wire; servers that don't offer the
+            # extension simply skip it during negotiation.
+            connect_kwargs["extensions"] = [
+                ClientPerMessageDeflateFactory(client_max_window_bits=15)
+            ]
+            connect_kwargs["compression"] = None
+        self._ws = connect(self.server_url, **connect_kwargs)  # type: ignore[call-arg]
+
+        # RPC frames are small; without TCP_NODELAY Nagle's algorithm can hold
+        # them back waiting for ACKs and add tens of ms per round-trip.
+        try:
+            self._ws.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (OSError, AttributeError):
+            # Not fatal — e.g. a proxy transport without a raw socket.
+            pass
+
+        self._reader = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader.start()
+        self._notif_consumer = threading.Thread(target=self._drain_notifications, daemon=True)
+        self._notif_consumer.start()
+
+        if self._stateless:
+            # No handshake round-trip; server_info/capabilities keep their
+            # empty defaults since a stateless server has nothing to report
+            # that the first real RPC depends on.
+            self.connected = True
+            return
 
         init_params = {
             "protocolVersion": "1.0",
@@ -68,13 +182,26 @@ class MCPWebSocketClient:
                 pass
             finally:
                 self._ws = None
+        if self._reader is not None and self._reader.is_alive():
+            self._reader.join(timeout=1)
+        self._reader = None
+        self._fail_pending(ConnectionError("MCP WebSocket client closed"))
+        if self._notif_consumer is not None and self._notif_consumer.is_alive():
+            try:
+                self._notif_queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._notif_consumer.join(timeout=1)
+        self._notif_consumer = None
         self.connected = False
 
     # ------------------------------------------------------------------
     # Discovery
     # ------------------------------------------------------------------
     def discover_tools(self) -> List[Dict[str, Any]]:
-        self.connect()
+        # Inline the connected check; the steady state skips a call frame.
+        if not self.connected:
+            self.connect()
 
         tools_map: Dict[str, Dict[str, Any]] = {}
         tools_via_rpc = self._discover_via_rpc()
@@ -87,9 +214,17 @@ class MCPWebSocketClient:
             tools_map[name] = merged
 
         self.tools_cache = tools_map
+        # Resolve the read tool once per discovery so read_file skips lookup.
+        self._read_file_tool = next(
+            (name for name in _READ_FILE_CANDIDATES if name in tools_map), None
+        )
         return list(tools_map.values())
 
     def _discover_via_rpc(self) -> List[Dict[str, Any]]:
+        # tools/list cursors are opaque and each one comes from the previous
+        # page, so pagination itself cannot be batched; the loop pipelines by
+        # issuing each follow-up as soon as its cursor arrives. Independent
+        # calls can share a round-trip via `_send_rpc_batch`.
         tools: List[Dict[str, Any]] = []
         cursor: Optional[str] = None
 
@@ -111,61 +246,182 @@ class MCPWebSocketClient:
     # Invocation
     # ------------------------------------------------------------------
     def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        self.connect()
-        payload = {"name": tool_name, "arguments": arguments or {}}
+        if not self.connected:
+            self.connect()
+        payload = {"name": tool_name, "arguments": arguments or EMPTY_PARAMS}
         result = self._send_rpc_request("tools/call", payload)
         return normalize_tool_result(result)
 
     def read_file(self, file_path: str) -> str:
-        for candidate in ("read_file", "readfile", "read_file_mcp"):
-            if candidate in self.tools_cache:
-                response = self.call_tool(candidate, {"path": file_path})
-                return response.get("content", "")
-        return f"Error: no read_file tool registered on {self.server_url}"
+        candidate = self._read_file_tool or next(
+            (name for name in _READ_FILE_CANDIDATES if name in self.tools_cache), None
+        )
+        if candidate is None:
+            return f"Error: no read_file tool registered on {self.server_url}"
+        self._read_file_tool = candidate
+        response = self.call_tool(candidate, {"path": file_path})
+        return response.get("content", "")
 
     # ------------------------------------------------------------------
     # JSON-RPC helpers
     # ------------------------------------------------------------------
     def _next_request_id(self) -> int:
-        self._request_id += 1
-        return self._request_id
+        with self._pending_lock:
+            self._request_id += 1
+            return self._request_id
+
+    def _register_pending(self, request_id: int) -> "Future[Dict[str, Any]]":
+        future: "Future[Dict[str, Any]]" = Future()
+        with self._pending_lock:
+            self._pending[request_id] = future
+        return future
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Unblock every in-flight caller with `error`."""
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _reader_loop(self) -> None:
+        """Route incoming frames to waiting callers by request id."""
+        while True:
+            ws = self._ws
+            if ws is None:
+                self._fail_pending(ConnectionError("MCP WebSocket connection closed"))
+                break
+            try:
+                raw = ws.recv()
+            except (ConnectionClosed, ConnectionClosedOK, ConnectionClosedError, OSError) as error:
+                # Callers blocked on future.result() must not hang forever
+                # when the connection drops mid-request.
+                self.connected = False
+                self._fail_pending(ConnectionError(f"MCP WebSocket connection closed: {error}"))
+                break
+            try:
+                data = _loads(raw)
+                messages = data if isinstance(data, list) else [data]
+                for item in messages:
+                    if not isinstance(item, dict):
+                        continue
+                    if "id" not in item:
+                        self._handle_notification(item)
+                        continue
+                    with self._pending_lock:
+                        future = self._pending.pop(item["id"], None)
+                    if future is not None:
+                        future.set_result(item)
+                    else:
+                        self._handle_out_of_order_message(item)
+            except Exception as error:
+                # A malformed frame must not kill the reader silently — that
+                # would leave every blocked future hanging forever. Fail them
+                # all and mark the client disconnected so the next call
+                # reconnects.
+                self.connected = False
+                self._fail_pending(ConnectionError(f"MCP WebSocket reader failed: {error}"))
+                break
 
     def _send_rpc_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        if not self.connected or self._ws is None:
+        if self._ws is None:
             raise RuntimeError("MCP WebSocket client is not connected")
 
         request_id = self._next_request_id()
-        message = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-            "params": params or {},
-        }
-
-        self._ws.send(json.dumps(message))
-
-        while True:
-            raw = self._ws.recv()
-            data = json.loads(raw)
+        frame = _encode_request(request_id, method, params or EMPTY_PARAMS)
 
-            if "id" not in data:
-                self._handle_notification(data)
-                continue
+        future = self._register_pending(request_id)
+        with self._send_lock:
+            self._ws.send(frame)
 
-            if data["id"] != request_id:
-                self._handle_out_of_order_message(data)
-                continue
+        data = future.result()
+        if "error" in data:
+            raise Exception(data["error"])
+        return data.get("result", {})
 
-            if "error" in data:
-                raise Exception(data["error"])
+    def _send_rpc_batch(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Send several independent JSON-RPC requests as one batch frame.
 
-            return data.get("result", {})
+        All requests share a single send and one network round-trip; responses
+        are matched by id (servers may answer a batch in any order) and the
+        results are returned in call order.
+        """
+        if self._ws is None:
+            raise RuntimeError("MCP WebSocket client is not connected")
+        if not calls:
+            return []
+
+        batch: List[Dict[str, Any]] = []
+        futures: List["Future[Dict[str, Any]]"] = []
+        for method, params in calls:
+            request_id = self._next_request_id()
+            futures.append(self._register_pending(request_id))
+            batch.append(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": params or EMPTY_PARAMS,
+                }
+            )
+
+        with self._send_lock:
+            self._ws.send(_dumps(batch))
+
+        results: List[Dict[str, Any]] = []
+        for future in futures:
+            item = future.result()
+            if "error" in item:
+                raise Exception(item["error"])
+            results.append(item.get("result", {}))
+        return results
 
     def _handle_notification(self, message: Dict[str, Any]) -> None:
-        print(f"🔔 MCP notification: {json.dumps(message, indent=2)}")
+        """Queue a notification for the consumer thread; never block recv.
+
+        Per-method coalescing keeps only the newest message for each
+        notification method, so a storm degrades to last-value-wins instead
+        of unbounded queueing or recv-path pretty-printing.
+        """
+        method = str(message.get("method") or "<unknown>")
+        with self._notif_lock:
+            already_queued = method in self._notif_latest
+            self._notif_latest[method] = message
+        if already_queued:
+            return
+        try:
+            self._notif_queue.put_nowait(method)
+        except queue.Full:
+            # Evict the oldest queued method to make room for the newest.
+            try:
+                stale = self._notif_queue.get_nowait()
+            except queue.Empty:
+                return
+            if stale is not None:
+                with self._notif_lock:
+                    self._notif_latest.pop(stale, None)
+            try:
+                self._notif_queue.put_nowait(method)
+            except queue.Full:
+                pass
+
+    def _drain_notifications(self) -> None:
+        """Log queued notifications off the recv hot path."""
+        while True:
+            method = self._notif_queue.get()
+            if method is None:
+                break
+            with self._notif_lock:
+                message = self._notif_latest.pop(method, None)
+            # %s formatting defers stringification to the handler; with DEBUG
+            # disabled each notification costs one level check.
+            if message is not None and _log.isEnabledFor(logging.DEBUG):
+                _log.debug("MCP notification: %s", message)
 
     def _handle_out_of_order_message(self, message: Dict[str, Any]) -> None:
-        print(f"⚠️  Out-of-order MCP message: {json.dumps(message, indent=2)}")
+        if _log.isEnabledFor(logging.WARNING):
+            _log.warning("Out-of-order MCP message: %s", message)
 
     def __del__(self) -> None:
         try:
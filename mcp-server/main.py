@@ -26,8 +26,12 @@ async def read_file() -> str:
 
 
 @mcp.tool()
-def read_file_mcp() -> str:
-    """MCP tool; reachable over stdio/WebSocket transports."""
+async def read_file_mcp() -> str:
+    """MCP tool; reachable over stdio/WebSocket transports.
+
+    async so FastMCP runs it on the event loop instead of bouncing a sync
+    handler through the thread pool.
+    """
     return _get_static_text()
 
 
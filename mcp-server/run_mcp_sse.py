@@ -1,4 +1,5 @@
 import asyncio
+import sys
 
 from main import mcp
 
@@ -13,6 +14,10 @@ async def main() -> None:
     mcp.settings.host = "0.0.0.0"
     mcp.settings.port = 8766
 
+    if sys.version_info >= (3, 12):
+        # Eager tasks run until their first real await without a scheduler pass.
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     await mcp.run_sse_async()
 
 
@@ -1,4 +1,5 @@
 import asyncio
+import sys
 
 from main import mcp
 
@@ -9,6 +10,10 @@ async def main() -> None:
 
     Exposes the same tools defined in `main.py` at `ws://<host>:8765/mcp`.
     """
+    if sys.version_info >= (3, 12):
+        # Eager tasks run until their first real await without a scheduler pass.
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     await mcp.run_websocket(host="0.0.0.0", port=8765)
 
 